@@ -124,7 +124,44 @@ find_feature_dir_by_prefix() {
     fi
 }
 
+# Ask the warm helper daemon (python -m src.utils.daemon serve) for feature paths.
+# Fails (so callers fall back to the in-process logic below) when the daemon is
+# not running, socat is unavailable, the request cannot be encoded safely, or the
+# daemon reports an error such as ambiguous spec directories (reported below).
+get_feature_paths_from_daemon() {
+    local default_socket
+    if [[ -n "${XDG_RUNTIME_DIR:-}" ]]; then
+        default_socket="${XDG_RUNTIME_DIR%/}/specify-helper.sock"
+    else
+        local tmp_dir="${TMPDIR:-/tmp}"
+        default_socket="${tmp_dir%/}/specify-helper-$(id -u)/helper.sock"
+    fi
+    local socket="${SPECIFY_HELPER_SOCKET:-$default_socket}"
+
+    # The reply is eval'd, so only trust a socket (and directory) owned by this user
+    [[ -S "$socket" && -O "$socket" && -O "$(dirname "$socket")" ]] || return 1
+    command -v socat >/dev/null 2>&1 || return 1
+
+    # Outside git the daemon must fall back to the same root as get_repo_root
+    local script_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+    local fallback_root="$(cd "$script_dir/../../.." && pwd)"
+
+    # Only plain values are forwarded; anything needing JSON escaping takes the slow path
+    local cwd="$PWD"
+    local feature="${SPECIFY_FEATURE:-}"
+    [[ "$cwd$feature$fallback_root" == *[\"\\]* ]] && return 1
+
+    local request="{\"op\":\"feature_paths\",\"raw\":true,\"args\":{\"cwd\":\"$cwd\",\"fallback_root\":\"$fallback_root\",\"specify_feature\":\"$feature\",\"format\":\"shell\"}}"
+    local response
+    response=$(printf '%s\n' "$request" | socat -t 1 - "UNIX-CONNECT:$socket" 2>/dev/null) || return 1
+    [[ -n "$response" ]] || return 1
+
+    printf '%s\n' "$response"
+}
+
 get_feature_paths() {
+    get_feature_paths_from_daemon && return 0
+
     local repo_root=$(get_repo_root)
     local current_branch=$(get_current_branch)
     local has_git_repo="false"
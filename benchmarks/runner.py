@@ -0,0 +1,306 @@
+"""
+Benchmark runner with JSON baselines and regression gating.
+
+Usage:
+    python -m benchmarks run [--output PATH] [--filter TEXT] [--repeat N]
+    python -m benchmarks compare [BASELINE] [--threshold FRACTION] [--output PATH]
+
+run only prints results unless --output is given, so looking at the numbers
+never replaces the baseline. The tracked metric is the best-of-repeats time
+per item (ns_per_item), which is the least sensitive to scheduler noise.
+compare exits non-zero when any benchmark is slower than its baseline by more
+than the threshold, when nothing was compared, or (without --filter) when a
+baseline benchmark did not run at all.
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.suite import BENCHMARKS, Benchmark
+from src.utils.validation import ValidationError, validate_file_path
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "baseline.json"
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_REPEAT = 5
+TRACKED_METRIC = "ns_per_item"
+
+
+class BenchmarkError(Exception):
+    """Raised when benchmark results cannot be loaded or compared."""
+    pass
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Result of comparing one benchmark against its baseline."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change in the tracked metric (positive is slower)."""
+        if self.baseline <= 0:
+            # A non-positive baseline is unusable; any measurable time counts as slower
+            return math.inf if self.current > 0 else 0.0
+        return self.current / self.baseline - 1
+
+    def regressed(self, threshold: float) -> bool:
+        """
+        Check whether the change exceeds the regression threshold.
+
+        Args:
+            threshold: Allowed relative slowdown (0.20 = 20%)
+
+        Returns:
+            True if the benchmark regressed
+        """
+        return self.change > threshold
+
+
+def run_benchmark(bench: Benchmark, repeat: int = DEFAULT_REPEAT) -> dict[str, Any]:
+    """
+    Time a single benchmark.
+
+    Args:
+        bench: Benchmark to run
+        repeat: Number of timed repeats
+
+    Returns:
+        Metrics for the benchmark
+    """
+    with bench.setup() as op:
+        timer = timeit.Timer(op)
+        number, _ = timer.autorange()
+        times = timer.repeat(repeat=repeat, number=number)
+
+    per_item = [t / number / bench.items * 1e9 for t in times]
+    best = min(per_item)
+    return {
+        TRACKED_METRIC: best,
+        "median_ns_per_item": statistics.median(per_item),
+        "items_per_second": 1e9 / best,
+        "items": bench.items,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run_suite(
+    benchmarks: Iterable[Benchmark] = BENCHMARKS,
+    name_filter: Optional[str] = None,
+    repeat: int = DEFAULT_REPEAT,
+) -> dict[str, Any]:
+    """
+    Run benchmarks and collect results.
+
+    Args:
+        benchmarks: Benchmarks to run
+        name_filter: Only run benchmarks whose name contains this text
+        repeat: Number of timed repeats per benchmark
+
+    Returns:
+        Results document with metadata and per-benchmark metrics
+    """
+    results = {
+        bench.name: run_benchmark(bench, repeat)
+        for bench in benchmarks
+        if name_filter is None or name_filter in bench.name
+    }
+    return {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "metric": TRACKED_METRIC,
+        },
+        "benchmarks": results,
+    }
+
+
+def save_results(results: dict[str, Any], path: Path) -> None:
+    """
+    Write results as JSON.
+
+    Args:
+        results: Results document
+        path: Output file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """
+    Load a results document.
+
+    Args:
+        path: Results file
+
+    Returns:
+        Results document
+
+    Raises:
+        BenchmarkError: If the file is missing or malformed
+    """
+    try:
+        validate_file_path(path)
+        results: dict[str, Any] = json.loads(path.read_text())
+    except (ValidationError, OSError, ValueError) as e:
+        raise BenchmarkError(f"Cannot load benchmark results from {path}: {e}") from e
+    if not isinstance(results.get("benchmarks"), dict):
+        raise BenchmarkError(f"Benchmark results missing 'benchmarks' section: {path}")
+    return results
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any]) -> list[Comparison]:
+    """
+    Compare current results against a baseline.
+
+    Benchmarks present in only one of the documents are skipped; use
+    missing_benchmarks() to detect baseline entries that no longer run.
+
+    Args:
+        baseline: Baseline results document
+        current: Current results document
+
+    Returns:
+        Comparisons for benchmarks present in both documents
+    """
+    base = baseline["benchmarks"]
+    return [
+        Comparison(name, base[name][TRACKED_METRIC], metrics[TRACKED_METRIC])
+        for name, metrics in current["benchmarks"].items()
+        if name in base
+    ]
+
+
+def missing_benchmarks(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """
+    Find baseline benchmarks that are absent from the current results.
+
+    Args:
+        baseline: Baseline results document
+        current: Current results document
+
+    Returns:
+        Sorted names of benchmarks only present in the baseline
+    """
+    return sorted(set(baseline["benchmarks"]) - set(current["benchmarks"]))
+
+
+def format_results(results: dict[str, Any]) -> str:
+    """
+    Format results as a text table.
+
+    Args:
+        results: Results document
+
+    Returns:
+        Table text
+    """
+    lines = [f"{'benchmark':<45} {'ns/item':>12} {'items/s':>14}"]
+    for name, metrics in sorted(results["benchmarks"].items()):
+        lines.append(
+            f"{name:<45} {metrics[TRACKED_METRIC]:>12.1f} {metrics['items_per_second']:>14,.0f}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def format_comparisons(comparisons: Sequence[Comparison], threshold: float) -> str:
+    """
+    Format comparisons as a text table.
+
+    Args:
+        comparisons: Benchmark comparisons
+        threshold: Allowed relative slowdown
+
+    Returns:
+        Table text
+    """
+    lines = [f"{'benchmark':<45} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for comparison in sorted(comparisons, key=lambda c: c.name):
+        status = "  REGRESSED" if comparison.regressed(threshold) else ""
+        lines.append(
+            f"{comparison.name:<45} {comparison.baseline:>12.1f} "
+            f"{comparison.current:>12.1f} {comparison.change:>+8.1%}{status}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code (1 if a regression or error was found)
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and print the results")
+    run_parser.add_argument("--output", type=Path, default=None)
+
+    compare_parser = subparsers.add_parser("compare", help="Fail on regressions vs a baseline")
+    compare_parser.add_argument("baseline", type=Path, nargs="?", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.add_argument("--output", type=Path, default=None)
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--filter", dest="name_filter", default=None)
+        sub.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+
+    args = parser.parse_args(argv)
+
+    try:
+        baseline = load_results(args.baseline) if args.command == "compare" else None
+    except BenchmarkError as e:
+        sys.stderr.write(f"ERROR: {e}\n")
+        return 1
+
+    results = run_suite(name_filter=args.name_filter, repeat=args.repeat)
+    if args.output is not None:
+        save_results(results, args.output)
+
+    if baseline is None:
+        sys.stdout.write(format_results(results))
+        return 0
+
+    comparisons = compare_results(baseline, results)
+    if not comparisons:
+        sys.stderr.write(f"ERROR: No benchmarks in common with the baseline {args.baseline}\n")
+        return 1
+    sys.stdout.write(format_comparisons(comparisons, args.threshold))
+    failed = False
+
+    regressions = [c.name for c in comparisons if c.regressed(args.threshold)]
+    if regressions:
+        sys.stderr.write(
+            f"ERROR: {len(regressions)} benchmark(s) regressed by more than "
+            f"{args.threshold:.0%}: {', '.join(regressions)}\n"
+        )
+        failed = True
+
+    # A filtered run only covers part of the suite, so absent names are expected then
+    missing = [] if args.name_filter else missing_benchmarks(baseline, results)
+    if missing:
+        sys.stderr.write(
+            f"ERROR: {len(missing)} baseline benchmark(s) did not run: {', '.join(missing)}\n"
+        )
+        failed = True
+
+    return 1 if failed else 0
@@ -0,0 +1,204 @@
+"""
+Benchmark definitions.
+
+Each benchmark is a context manager that prepares realistic data, yields the
+operation to time, and cleans up afterwards. Operations process a batch of
+items so per-item timings are not dominated by call overhead.
+"""
+
+import contextlib
+import os
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.utils.config import Config
+from src.utils.logging import configure_logging, correlation_scope, get_logger
+from src.utils.validation import (
+    ValidationError,
+    validate_file_path,
+    validate_memory_key,
+    validate_string_pattern,
+)
+
+BATCH_SIZE = 1000
+ENV_VARS = 200
+LOG_EVENTS = 200
+
+Operation = Callable[[], None]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A named benchmark."""
+
+    name: str
+    setup: Callable[[], AbstractContextManager[Operation]]
+    items: int = BATCH_SIZE
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(
+    name: str, items: int = BATCH_SIZE
+) -> Callable[[Callable[[], Iterator[Operation]]], Callable[[], AbstractContextManager[Operation]]]:
+    """
+    Register a benchmark setup generator.
+
+    Args:
+        name: Benchmark name (dotted, grouped by module)
+        items: Items processed per operation
+
+    Returns:
+        Decorator registering the setup as a context manager
+    """
+    def decorator(
+        func: Callable[[], Iterator[Operation]]
+    ) -> Callable[[], AbstractContextManager[Operation]]:
+        setup = contextlib.contextmanager(func)
+        BENCHMARKS.append(Benchmark(name, setup, items))
+        return setup
+
+    return decorator
+
+
+@contextlib.contextmanager
+def _populated_environ() -> Iterator[list[str]]:
+    """Add a realistic number of configuration variables to the environment."""
+    keys = [f"BENCH_SETTING_{i:03d}" for i in range(ENV_VARS)]
+    for i, key in enumerate(keys):
+        os.environ[key] = str(i)
+    try:
+        yield keys
+    finally:
+        for key in keys:
+            del os.environ[key]
+
+
+@benchmark("config.get")
+def bench_config_get() -> Iterator[Operation]:
+    with _populated_environ() as keys:
+        config = Config()
+        lookups = [keys[i % len(keys)] for i in range(BATCH_SIZE)]
+
+        def op() -> None:
+            for key in lookups:
+                config.get(key)
+
+        yield op
+
+
+@benchmark("config.get_int")
+def bench_config_get_int() -> Iterator[Operation]:
+    with _populated_environ() as keys:
+        config = Config()
+        lookups = [keys[i % len(keys)] for i in range(BATCH_SIZE)]
+
+        def op() -> None:
+            for key in lookups:
+                config.get_int(key)
+
+        yield op
+
+
+@benchmark("config.get_bool")
+def bench_config_get_bool() -> Iterator[Operation]:
+    with _populated_environ() as keys:
+        config = Config()
+        lookups = [keys[i % len(keys)] for i in range(BATCH_SIZE)]
+
+        def op() -> None:
+            for key in lookups:
+                config.get_bool(key)
+
+        yield op
+
+
+@benchmark("config.get_path")
+def bench_config_get_path() -> Iterator[Operation]:
+    with _populated_environ() as keys:
+        config = Config()
+        lookups = [keys[i % len(keys)] for i in range(BATCH_SIZE)]
+
+        def op() -> None:
+            for key in lookups:
+                config.get_path(key)
+
+        yield op
+
+
+@benchmark("validation.validate_string_pattern")
+def bench_validate_string_pattern() -> Iterator[Operation]:
+    values = [f"feature-{i:04d}-" + "x" * 48 for i in range(BATCH_SIZE)]
+    pattern = r"^[a-z0-9-]+$"
+
+    def op() -> None:
+        for value in values:
+            validate_string_pattern(value, pattern, "branch", min_length=1, max_length=100)
+
+    yield op
+
+
+@benchmark("validation.validate_memory_key")
+def bench_validate_memory_key() -> Iterator[Operation]:
+    context_types = ("patterns", "context", "decisions", "constraints")
+    keys = [
+        f"prompt_dna:main:{i % 100:03d}-feature-name:{context_types[i % 4]}"
+        for i in range(BATCH_SIZE)
+    ]
+
+    def op() -> None:
+        for key in keys:
+            validate_memory_key(key)
+
+    yield op
+
+
+@benchmark("validation.validate_memory_key_invalid")
+def bench_validate_memory_key_invalid() -> Iterator[Operation]:
+    keys = [f"prompt_dna:main:{i:03d}-feature:unknown" for i in range(BATCH_SIZE)]
+
+    def op() -> None:
+        for key in keys:
+            try:
+                validate_memory_key(key)
+            except ValidationError:
+                pass
+
+    yield op
+
+
+@benchmark("validation.validate_file_path")
+def bench_validate_file_path() -> Iterator[Operation]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        paths = []
+        for i in range(BATCH_SIZE):
+            directory = root / f"specs/{i % 20:03d}-feature"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"doc-{i}.md"
+            path.touch()
+            paths.append(str(path))
+
+        def op() -> None:
+            for path in paths:
+                validate_file_path(path)
+
+        yield op
+
+
+@benchmark("logging.events", items=LOG_EVENTS)
+def bench_logging_events() -> Iterator[Operation]:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        configure_logging()
+        logger = get_logger("benchmarks").bind(feature="001-repo-setup", branch="main")
+
+        def op() -> None:
+            with correlation_scope():
+                for i in range(LOG_EVENTS):
+                    logger.info("request_handled", index=i, status="ok", duration_ms=12.5)
+
+        yield op
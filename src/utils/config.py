@@ -8,6 +8,11 @@ import os
 from pathlib import Path
 from typing import Any, Optional
 
+from src.utils.logging import get_logger
+
+# Environment variable naming a shared config block published by a parent process
+SHARED_CONFIG_ENV = "SPECIFY_SHARED_CONFIG"
+
 
 class ConfigError(Exception):
     """Raised when configuration is invalid."""
@@ -138,15 +143,36 @@ def get_config(env_file: Optional[Path] = None) -> Config:
     """
     Get global configuration instance.
     
+    Worker processes attach to the parent's shared snapshot instead of
+    re-parsing when SPECIFY_SHARED_CONFIG is set (see shared_config). The
+    snapshot already reflects the parent's .env, so env_file is not loaded
+    in that case unless the block is gone and parsing falls back to it.
+    
     Args:
         env_file: Optional path to .env file
         
     Returns:
         Configuration instance
+        
+    Raises:
+        ConfigError: If the shared block exists but cannot be used (e.g. an
+            invalid SPECIFY_SHARED_CONFIG_SLOT)
     """
     global _config
     
     if _config is None:
-        _config = Config(env_file)
+        if os.environ.get(SHARED_CONFIG_ENV):
+            from src.utils.shared_config import SharedConfigNotFoundError, attach_config
+            
+            # Only a vanished block falls back; misconfiguration must not silently re-parse
+            try:
+                _config = attach_config()
+            except SharedConfigNotFoundError as e:
+                get_logger(__name__).warning(
+                    "shared_config_unavailable", block=os.environ[SHARED_CONFIG_ENV], error=str(e)
+                )
+                _config = Config(env_file)
+        else:
+            _config = Config(env_file)
     
     return _config
@@ -0,0 +1,605 @@
+"""
+Warm helper daemon for the .specify shell scripts.
+
+Keeps repository state (repo root, current branch, feature paths) cached in a
+long-lived process and answers line-delimited JSON requests over a Unix socket.
+The client falls back to in-process execution when the daemon is not running.
+"""
+
+import json
+import os
+import re
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+from src.utils.config import ConfigError, get_config
+from src.utils.logging import get_logger
+from src.utils.validation import ValidationError, validate_file_path, validate_memory_key
+
+logger = get_logger(__name__)
+
+FEATURE_PREFIX_PATTERN = re.compile(r"^([0-9]{3})-")
+
+# Repository containing this module; matches get_repo_root's script-relative fallback
+DEFAULT_FALLBACK_ROOT = Path(__file__).resolve().parents[2]
+
+CALL_MIN_ARGS = 2
+CALL_ARGS_WITH_JSON = 3
+
+
+class DaemonError(Exception):
+    """Raised when a daemon request cannot be served."""
+    pass
+
+
+def default_socket_path() -> Path:
+    """
+    Get the helper socket path.
+
+    Uses SPECIFY_HELPER_SOCKET when set, otherwise $XDG_RUNTIME_DIR, otherwise a
+    private per-user directory in the system temp directory (never a shared
+    directory, where another user could bind the name first).
+
+    Returns:
+        Socket path
+    """
+    config = get_config()
+    runtime_dir = config.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        default = Path(runtime_dir) / "specify-helper.sock"
+    else:
+        default = Path(tempfile.gettempdir()) / f"specify-helper-{os.getuid()}" / "helper.sock"
+    path = config.get_path("SPECIFY_HELPER_SOCKET", default=default)
+    assert path is not None
+    return path
+
+
+def _check_owner(path: Path, follow_symlinks: bool = True) -> None:
+    """
+    Ensure a path belongs to the current user.
+
+    Args:
+        path: Socket or directory to check
+        follow_symlinks: Whether to check the symlink target instead of the link
+
+    Raises:
+        DaemonError: If the path is owned by another user
+        OSError: If the path cannot be inspected
+    """
+    owner = os.stat(path, follow_symlinks=follow_symlinks).st_uid
+    if owner != os.getuid():
+        raise DaemonError(f"Refusing helper socket path owned by uid {owner}: {path}")
+
+
+def _git(cwd: Path, *args: str) -> Optional[str]:
+    """
+    Run a git command and return its stripped output.
+
+    Args:
+        cwd: Working directory
+        *args: git arguments
+
+    Returns:
+        Command output, or None if git failed
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, text=True, check=False
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+class RepoState:
+    """Cached repository state for one working directory."""
+
+    def __init__(self, cwd: Path, fallback_root: Optional[Path] = None) -> None:
+        """
+        Initialize repository state.
+
+        Args:
+            cwd: Working directory the scripts run from
+            fallback_root: Repository root to use outside git (the scripts' own checkout)
+        """
+        self.cwd = cwd
+        self.fallback_root = fallback_root or DEFAULT_FALLBACK_ROOT
+        self._lock = threading.Lock()
+        self._root: Optional[Path] = None
+        self._has_git = False
+        self._head_path: Optional[Path] = None
+        self._head_mtime: Optional[int] = None
+        self._branch: Optional[str] = None
+        self._resolve_root()
+
+    def _resolve_root(self) -> None:
+        """Resolve the repository root once, falling back like get_repo_root in common.sh."""
+        toplevel = _git(self.cwd, "rev-parse", "--show-toplevel")
+        if toplevel:
+            self._root = Path(toplevel)
+            self._has_git = True
+            git_dir = _git(self.cwd, "rev-parse", "--absolute-git-dir")
+            if git_dir:
+                self._head_path = Path(git_dir) / "HEAD"
+        else:
+            self._root = self.fallback_root
+
+    @property
+    def root(self) -> Path:
+        """Repository root."""
+        assert self._root is not None
+        return self._root
+
+    @property
+    def has_git(self) -> bool:
+        """Whether the working directory is inside a git repository."""
+        return self._has_git
+
+    def _head_stamp(self) -> Optional[int]:
+        """Get the HEAD file mtime used to invalidate the cached branch."""
+        if self._head_path is None:
+            return None
+        try:
+            return self._head_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def branch(self, specify_feature: Optional[str] = None) -> str:
+        """
+        Get the current branch, mirroring get_current_branch in common.sh.
+
+        Args:
+            specify_feature: Value of SPECIFY_FEATURE in the caller's environment
+
+        Returns:
+            Branch or feature name
+        """
+        if specify_feature:
+            return specify_feature
+
+        if self._has_git:
+            with self._lock:
+                stamp = self._head_stamp()
+                if self._branch is None or stamp is None or stamp != self._head_mtime:
+                    self._branch = _git(self.cwd, "rev-parse", "--abbrev-ref", "HEAD")
+                    self._head_mtime = stamp
+                if self._branch:
+                    return self._branch
+
+        return self._latest_feature() or "main"
+
+    def _latest_feature(self) -> Optional[str]:
+        """Find the highest-numbered feature directory under specs/."""
+        specs_dir = self.root / "specs"
+        if not specs_dir.is_dir():
+            return None
+
+        latest: Optional[str] = None
+        highest = 0
+        for entry in specs_dir.iterdir():
+            match = FEATURE_PREFIX_PATTERN.match(entry.name)
+            if entry.is_dir() and match:
+                number = int(match.group(1))
+                if number > highest:
+                    highest = number
+                    latest = entry.name
+        return latest
+
+    def feature_dir(self, branch: str) -> Path:
+        """
+        Find the feature directory by numeric prefix, mirroring common.sh.
+
+        Args:
+            branch: Branch name
+
+        Returns:
+            Feature directory path
+
+        Raises:
+            DaemonError: If several spec directories share the branch's prefix
+        """
+        specs_dir = self.root / "specs"
+        match = FEATURE_PREFIX_PATTERN.match(branch)
+        if not match:
+            return specs_dir / branch
+
+        matches = []
+        if specs_dir.is_dir():
+            matches = sorted(
+                entry.name
+                for entry in specs_dir.glob(f"{match.group(1)}-*")
+                if entry.is_dir()
+            )
+
+        if len(matches) == 1:
+            return specs_dir / matches[0]
+        if matches:
+            raise DaemonError(
+                f"Multiple spec directories found with prefix '{match.group(1)}': "
+                f"{' '.join(matches)}"
+            )
+        return specs_dir / branch
+
+    def feature_paths(self, specify_feature: Optional[str] = None) -> dict[str, str]:
+        """
+        Get the feature path variables emitted by get_feature_paths in common.sh.
+
+        Args:
+            specify_feature: Value of SPECIFY_FEATURE in the caller's environment
+
+        Returns:
+            Mapping of shell variable names to values
+
+        Raises:
+            DaemonError: If the feature directory is ambiguous
+        """
+        branch = self.branch(specify_feature)
+        feature_dir = self.feature_dir(branch)
+        return {
+            "REPO_ROOT": str(self.root),
+            "CURRENT_BRANCH": branch,
+            "HAS_GIT": "true" if self._has_git else "false",
+            "FEATURE_DIR": str(feature_dir),
+            "FEATURE_SPEC": str(feature_dir / "spec.md"),
+            "IMPL_PLAN": str(feature_dir / "plan.md"),
+            "TASKS": str(feature_dir / "tasks.md"),
+            "RESEARCH": str(feature_dir / "research.md"),
+            "DATA_MODEL": str(feature_dir / "data-model.md"),
+            "QUICKSTART": str(feature_dir / "quickstart.md"),
+            "CONTRACTS_DIR": str(feature_dir / "contracts"),
+        }
+
+
+class HelperState:
+    """Warm caches shared by all requests served from one process."""
+
+    def __init__(self) -> None:
+        """Initialize empty caches."""
+        self._lock = threading.Lock()
+        self._repos: dict[tuple[Path, Optional[Path]], RepoState] = {}
+
+    def repo(self, cwd: str | Path, fallback_root: Optional[str | Path] = None) -> RepoState:
+        """
+        Get cached repository state for a working directory.
+
+        Args:
+            cwd: Working directory
+            fallback_root: Repository root to use outside git
+
+        Returns:
+            Repository state
+        """
+        path = validate_file_path(cwd, must_be_file=False, must_be_dir=True).resolve()
+        fallback = Path(fallback_root).resolve() if fallback_root else None
+        with self._lock:
+            state = self._repos.get((path, fallback))
+            if state is None:
+                state = RepoState(path, fallback)
+                self._repos[(path, fallback)] = state
+            return state
+
+    def clear(self) -> None:
+        """Drop all cached repository state."""
+        with self._lock:
+            self._repos.clear()
+
+    def dispatch(self, op: str, args: dict[str, Any]) -> Any:
+        """
+        Execute a request.
+
+        Args:
+            op: Operation name
+            args: Operation arguments
+
+        Returns:
+            JSON-serializable result
+
+        Raises:
+            DaemonError: If the operation is unknown
+        """
+        handler = _OPERATIONS.get(op)
+        if handler is None:
+            raise DaemonError(f"Unknown operation: {op}")
+        return handler(self, args)
+
+
+def _op_ping(state: HelperState, args: dict[str, Any]) -> str:
+    return "pong"
+
+
+def _op_feature_paths(state: HelperState, args: dict[str, Any]) -> dict[str, str] | str:
+    repo = state.repo(args.get("cwd", os.getcwd()), args.get("fallback_root"))
+    paths = repo.feature_paths(args.get("specify_feature"))
+    if args.get("format") == "shell":
+        return format_shell_assignments(paths)
+    return paths
+
+
+def _op_validate_file_path(state: HelperState, args: dict[str, Any]) -> str:
+    # Relative paths are resolved against the caller's cwd, not the daemon's
+    path = Path(args["path"])
+    validate_file_path(
+        Path(args.get("cwd", os.getcwd())) / path,
+        must_exist=args.get("must_exist", True),
+        must_be_file=args.get("must_be_file", True),
+        must_be_dir=args.get("must_be_dir", False),
+    )
+    return str(path)
+
+
+def _op_validate_memory_key(state: HelperState, args: dict[str, Any]) -> str:
+    return validate_memory_key(args["key"])
+
+
+def _op_invalidate(state: HelperState, args: dict[str, Any]) -> bool:
+    state.clear()
+    return True
+
+
+_OPERATIONS: dict[str, Callable[[HelperState, dict[str, Any]], Any]] = {
+    "ping": _op_ping,
+    "feature_paths": _op_feature_paths,
+    "validate_file_path": _op_validate_file_path,
+    "validate_memory_key": _op_validate_memory_key,
+    "invalidate": _op_invalidate,
+}
+
+_ERROR_TYPES: dict[str, type[Exception]] = {
+    "ValidationError": ValidationError,
+    "ConfigError": ConfigError,
+    "DaemonError": DaemonError,
+}
+
+
+def handle_request(state: HelperState, line: bytes) -> dict[str, Any]:
+    """
+    Decode and execute a single request line.
+
+    Requests may set "raw" to have a string result written to the socket
+    verbatim (and nothing on error), so shell callers can eval the output
+    without a JSON parser and fall back when it is empty.
+
+    Args:
+        state: Helper state
+        line: Raw JSON request
+
+    Returns:
+        Response dictionary with either result or error fields
+    """
+    raw = False
+    try:
+        request = json.loads(line)
+        raw = bool(request.get("raw"))
+        result = state.dispatch(request["op"], request.get("args", {}))
+    except (ValidationError, ConfigError, DaemonError) as e:
+        return {"ok": False, "raw": raw, "type": type(e).__name__, "error": str(e)}
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        return {"ok": False, "raw": raw, "type": "DaemonError", "error": f"Bad request: {e}"}
+    return {"ok": True, "raw": raw and isinstance(result, str), "result": result}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serve one request per connection."""
+
+    server: "HelperDaemon"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        response = handle_request(self.server.state, line)
+        if not response.pop("raw"):
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+        elif response["ok"]:
+            self.wfile.write(response["result"].encode())
+
+
+class HelperDaemon(socketserver.ThreadingUnixStreamServer):
+    """Unix-socket server holding warm helper state."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Optional[Path] = None) -> None:
+        """
+        Bind the daemon socket.
+
+        Args:
+            socket_path: Socket path (defaults to default_socket_path())
+
+        Raises:
+            DaemonError: If another daemon is already listening on the path, or
+                the socket or its directory belongs to another user
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.state = HelperState()
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        _check_owner(self.socket_path.parent)
+        if self.socket_path.exists():
+            _check_owner(self.socket_path, follow_symlinks=False)
+            if _connect(self.socket_path) is not None:
+                raise DaemonError(f"Helper daemon already running: {self.socket_path}")
+            self.socket_path.unlink()
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+        logger.info("helper_daemon_started", socket=str(self.socket_path))
+
+    def server_close(self) -> None:
+        """Close the server and remove the socket file."""
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+        logger.info("helper_daemon_stopped", socket=str(self.socket_path))
+
+
+def _connect(socket_path: Path, timeout: float = 1.0) -> Optional[socket.socket]:
+    """
+    Connect to the daemon socket, returning None if nothing is listening.
+
+    Raises:
+        DaemonError: If the socket or its directory belongs to another user
+    """
+    try:
+        _check_owner(socket_path.parent)
+        _check_owner(socket_path, follow_symlinks=False)
+    except OSError:
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+class HelperClient:
+    """Thin client that talks to the daemon or executes requests in-process."""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = 1.0) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Socket path (defaults to default_socket_path())
+            timeout: Socket timeout in seconds
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._local: Optional[HelperState] = None
+
+    def _request_remote(self, payload: bytes) -> Optional[dict[str, Any]]:
+        """Send a request to the daemon, returning None if it is unreachable or untrusted."""
+        try:
+            sock = _connect(self.socket_path, self.timeout)
+        except DaemonError as e:
+            logger.warning("helper_socket_rejected", socket=str(self.socket_path), error=str(e))
+            return None
+        if sock is None:
+            return None
+        try:
+            with sock, sock.makefile("rwb") as stream:
+                stream.write(payload + b"\n")
+                stream.flush()
+                line = stream.readline()
+        except OSError:
+            return None
+        if not line:
+            return None
+        response: dict[str, Any] = json.loads(line)
+        return response
+
+    def request(self, op: str, **args: Any) -> Any:
+        """
+        Execute a request via the daemon, falling back to in-process execution.
+
+        The caller's working directory is sent as "cwd" unless given, so
+        relative paths resolve the same way in both modes.
+
+        Args:
+            op: Operation name
+            **args: Operation arguments
+
+        Returns:
+            Operation result
+
+        Raises:
+            ValidationError: If validation fails
+            ConfigError: If configuration is invalid
+            DaemonError: If the request is malformed
+        """
+        args.setdefault("cwd", os.getcwd())
+        payload = json.dumps({"op": op, "args": args}).encode()
+        response = self._request_remote(payload)
+        if response is None:
+            if self._local is None:
+                self._local = HelperState()
+            response = handle_request(self._local, payload)
+
+        if not response["ok"]:
+            error_type = _ERROR_TYPES.get(response["type"], DaemonError)
+            raise error_type(response["error"])
+        return response["result"]
+
+
+def format_shell_assignments(values: dict[str, str]) -> str:
+    """
+    Format variables as shell assignments for eval, like get_feature_paths.
+
+    Args:
+        values: Variable names and values
+
+    Returns:
+        Newline-separated NAME='value' lines
+    """
+    lines = []
+    for key, value in values.items():
+        quoted = value.replace("'", "'\\''")
+        lines.append(f"{key}='{quoted}'")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Usage:
+        python -m src.utils.daemon serve
+        python -m src.utils.daemon feature-paths
+        python -m src.utils.daemon call <op> [json-args]
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        sys.stderr.write("Usage: daemon.py serve | feature-paths | call <op> [json-args]\n")
+        return 2
+
+    command = args[0]
+    if command == "serve":
+        server = HelperDaemon()
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    client = HelperClient()
+    try:
+        if command == "feature-paths":
+            paths = client.request(
+                "feature_paths",
+                specify_feature=os.environ.get("SPECIFY_FEATURE"),
+            )
+            sys.stdout.write(format_shell_assignments(paths))
+            return 0
+        if command == "call" and len(args) >= CALL_MIN_ARGS:
+            call_args = json.loads(args[2]) if len(args) >= CALL_ARGS_WITH_JSON else {}
+            sys.stdout.write(json.dumps(client.request(args[1], **call_args)) + "\n")
+            return 0
+    except (ValidationError, ConfigError, DaemonError, ValueError) as e:
+        sys.stderr.write(f"ERROR: {e}\n")
+        return 1
+
+    sys.stderr.write(f"ERROR: Unknown command '{command}'\n")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,18 +5,196 @@ This module provides JSON-formatted logging with correlation IDs for observabili
 Follows constitution principle: NO print statements, structured logging only.
 """
 
+import contextvars
+import functools
 import logging
+import os
 import sys
+import threading
+import time
 import uuid
-from typing import Any
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Optional, ParamSpec, TypeVar
 
 import structlog
 
+# Environment variable carrying the correlation ID into child processes
+CORRELATION_ID_ENV = "CORRELATION_ID"
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def new_correlation_id() -> str:
+    """
+    Generate a time-ordered correlation ID (UUIDv7 layout).
+    
+    The leading 48 bits are the Unix time in milliseconds, so IDs sort by
+    creation time and index with better locality than random UUIDv4s.
+    
+    Returns:
+        Correlation ID string
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+
+def get_correlation_id() -> Optional[str]:
+    """
+    Get the correlation ID bound to the current context.
+    
+    Returns:
+        Bound correlation ID, or None if no request scope is active
+    """
+    correlation_id: Optional[str] = structlog.contextvars.get_contextvars().get("correlation_id")
+    return correlation_id
+
+
+class _ProcessCorrelation:
+    """Process root correlation ID, read from CORRELATION_ID once per process."""
+    
+    def __init__(self) -> None:
+        """Initialize without reading the environment yet."""
+        self._lock = threading.Lock()
+        self._root_id: Optional[str] = None
+        self._inherited: Optional[str] = None
+    
+    def _load(self) -> str:
+        """Read the environment on first use (caller holds the lock)."""
+        if self._root_id is None:
+            self._inherited = os.environ.get(CORRELATION_ID_ENV)
+            self._root_id = self._inherited or new_correlation_id()
+        return self._root_id
+    
+    def root_id(self) -> str:
+        """Get the ID for events logged outside any correlation scope."""
+        with self._lock:
+            return self._load()
+    
+    def claim_inherited(self) -> Optional[str]:
+        """Hand the parent's ID to the first top-level scope, then stop returning it."""
+        with self._lock:
+            self._load()
+            inherited, self._inherited = self._inherited, None
+            return inherited
+
+
+_process_correlation = _ProcessCorrelation()
+
+
+def process_correlation_id() -> str:
+    """
+    Get the process's root correlation ID.
+    
+    The ID inherited from a parent process via CORRELATION_ID, otherwise an
+    ID generated once for this process. Events logged outside any scope are
+    grouped under it.
+    
+    Returns:
+        Root correlation ID
+    """
+    return _process_correlation.root_id()
+
+
+def _resolve_correlation_id(correlation_id: Optional[str]) -> str:
+    """Pick the explicit, currently bound, inherited (first scope only) or a new ID."""
+    return (
+        correlation_id
+        or get_correlation_id()
+        or _process_correlation.claim_inherited()
+        or new_correlation_id()
+    )
+
+
+def bind_correlation_id(correlation_id: Optional[str] = None) -> str:
+    """
+    Bind a correlation ID to the current context.
+    
+    Args:
+        correlation_id: ID to bind (defaults to the bound, inherited or a new ID)
+        
+    Returns:
+        The bound correlation ID
+    """
+    correlation_id = _resolve_correlation_id(correlation_id)
+    structlog.contextvars.bind_contextvars(correlation_id=correlation_id)
+    return correlation_id
+
+
+@contextmanager
+def correlation_scope(correlation_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Bind one correlation ID for a unit of work.
+    
+    Without an explicit ID, a nested scope keeps the enclosing scope's ID. A
+    top-level scope takes the ID inherited from the parent process the first
+    time only, so a long-lived child does not merge later work into it, and
+    otherwise starts a new ID.
+    
+    Asyncio tasks created inside the scope inherit the ID automatically;
+    use ContextThreadPoolExecutor for thread pools and correlation_env()
+    for child processes.
+    
+    Args:
+        correlation_id: ID to bind (defaults to the bound, inherited or a new ID)
+        
+    Yields:
+        The bound correlation ID
+    """
+    correlation_id = _resolve_correlation_id(correlation_id)
+    with structlog.contextvars.bound_contextvars(correlation_id=correlation_id):
+        yield correlation_id
+
+
+def correlation_env(env: Optional[Mapping[str, str]] = None) -> dict[str, str]:
+    """
+    Build a child process environment carrying the current correlation ID.
+    
+    Args:
+        env: Base environment (defaults to os.environ)
+        
+    Returns:
+        Environment for subprocess calls
+    """
+    child_env = dict(os.environ if env is None else env)
+    correlation_id = get_correlation_id()
+    if correlation_id:
+        child_env[CORRELATION_ID_ENV] = correlation_id
+    return child_env
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool that runs each task in a copy of the submitting context."""
+    
+    def submit(self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+        """
+        Submit a task that sees the caller's context variables.
+        
+        Args:
+            fn: Callable to execute
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+            
+        Returns:
+            Future for the result
+        """
+        context = contextvars.copy_context()
+        return super().submit(functools.partial(context.run, fn, *args, **kwargs))
+
 
 def add_correlation_id(logger: logging.Logger, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
     """
     Add correlation ID to log context.
     
+    IDs bound via correlation_scope are merged earlier by merge_contextvars;
+    events logged outside any scope get the process's root ID (see
+    process_correlation_id), so they are grouped per process.
+    
     Args:
         logger: The logger instance
         method_name: The logging method name
@@ -26,7 +204,7 @@ def add_correlation_id(logger: logging.Logger, method_name: str, event_dict: dic
         Updated event dictionary with correlation ID
     """
     if "correlation_id" not in event_dict:
-        event_dict["correlation_id"] = str(uuid.uuid4())
+        event_dict["correlation_id"] = process_correlation_id()
     return event_dict
 
 
@@ -0,0 +1,481 @@
+"""
+Shared-memory configuration and counters for worker processes.
+
+A parent process publishes a parsed configuration snapshot and a block of
+counters into multiprocessing.shared_memory. Workers attach by name in constant
+time instead of re-parsing .env files, and use the version stamp to detect
+reloads cheaply.
+
+Block layout (little-endian):
+    header   magic, slot count, version, payload length, counter count
+    counters int64[slots][counters], one row per worker slot
+    payload  JSON {"values": {...}, "counters": [...]}
+
+Row 0 belongs to the publishing process and each worker increments only its
+own row, given by SPECIFY_SHARED_CONFIG_SLOT or attach_config(slot=...), so
+counter updates never race across processes; readers sum the rows. Workers
+attached without a slot can read counters but not increment them.
+
+The payload is guarded by a seqlock: the version is odd while the parent is
+rewriting it.
+"""
+
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+from src.utils.config import SHARED_CONFIG_ENV, Config, ConfigError
+
+MAGIC = b"SCFG"
+HEADER = struct.Struct("<4sIQII")
+VERSION_OFFSET = 8
+LENGTH_OFFSET = 16
+COUNTER_SIZE = 8
+DEFAULT_SIZE = 64 * 1024
+READ_RETRIES = 1000
+OWNER_SLOT = 0
+# Publisher row plus one per CPU, matching ProcessPoolExecutor's default pool size
+DEFAULT_SLOTS = (os.cpu_count() or 1) + 1
+
+# Environment variable giving a worker its counter row
+SHARED_CONFIG_SLOT_ENV = "SPECIFY_SHARED_CONFIG_SLOT"
+
+
+class SharedConfigError(ConfigError):
+    """Raised when a shared configuration block is invalid or full."""
+    pass
+
+
+class SharedConfigNotFoundError(SharedConfigError):
+    """Raised when a named shared configuration block no longer exists."""
+    pass
+
+
+def _attach_segment(name: str) -> SharedMemory:
+    """
+    Attach to an existing shared memory segment without taking ownership.
+
+    Args:
+        name: Segment name
+
+    Returns:
+        Attached segment
+    """
+    if sys.version_info >= (3, 13):  # pragma: no cover
+        return SharedMemory(name=name, track=False)
+
+    # Before 3.13 attaching always registers with the resource tracker. A tracker
+    # inherited from the parent already knows the segment, but one started just for
+    # this process would unlink it on exit, so only unregister from our own tracker.
+    owns_tracker = resource_tracker._resource_tracker._fd is None  # type: ignore[attr-defined]
+    shm = SharedMemory(name=name)
+    if owns_tracker:
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+class SharedState:
+    """Configuration snapshot and counters stored in a shared memory block."""
+
+    def __init__(
+        self, shm: SharedMemory, slot: Optional[int] = None, owner: bool = False
+    ) -> None:
+        """
+        Wrap a shared memory block. Use create() or attach() instead.
+
+        Args:
+            shm: Shared memory segment
+            slot: Counter row this process writes to (None for read-only counters)
+            owner: Whether this process created (and may unlink) the block
+
+        Raises:
+            SharedConfigError: If the block is not a shared config block or slot is invalid
+        """
+        assert shm.buf is not None
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+        self._lock = threading.Lock()
+
+        magic, slots, _, _, num_counters = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            self._release()
+            raise SharedConfigError(f"Not a shared config block: {shm.name}")
+        if owner:
+            slot = OWNER_SLOT
+        elif slot is not None and not OWNER_SLOT < slot < slots:
+            self._release()
+            raise SharedConfigError(
+                f"Counter slot {slot} out of range (1-{slots - 1}; "
+                f"slot {OWNER_SLOT} belongs to the publishing process)"
+            )
+
+        self.slot = slot
+        self.slots = slots
+        self._payload_offset = HEADER.size + slots * num_counters * COUNTER_SIZE
+        self._counters = self._buf[HEADER.size:self._payload_offset].cast("q")
+        self._row = None if slot is None else slot * num_counters
+
+        self._version = -1
+        self._values: dict[str, str] = {}
+        self._counter_index: dict[str, int] = {}
+        self.refresh()
+
+    @classmethod
+    def create(
+        cls,
+        values: Mapping[str, str],
+        counters: Sequence[str] = (),
+        slots: int = DEFAULT_SLOTS,
+        size: int = DEFAULT_SIZE,
+        name: Optional[str] = None,
+    ) -> "SharedState":
+        """
+        Create and publish a new shared block.
+
+        Args:
+            values: Configuration snapshot
+            counters: Counter names
+            slots: Number of counter rows (row 0 is the publisher's, the rest are workers')
+            size: Total block size in bytes
+            name: Optional segment name (generated if omitted)
+
+        Returns:
+            Owning shared state (slot 0)
+
+        Raises:
+            SharedConfigError: If the layout does not fit in size
+        """
+        if slots < 1:
+            raise SharedConfigError("At least one counter slot is required")
+        payload_offset = HEADER.size + slots * len(counters) * COUNTER_SIZE
+        if payload_offset >= size:
+            raise SharedConfigError(f"Shared config size {size} too small for counters")
+
+        shm = SharedMemory(name=name, create=True, size=size)
+        assert shm.buf is not None
+        HEADER.pack_into(shm.buf, 0, MAGIC, slots, 0, 0, len(counters))
+        shm.buf[HEADER.size:payload_offset] = bytes(payload_offset - HEADER.size)
+        state = cls(shm, owner=True)
+        try:
+            state._counter_index = {counter: i for i, counter in enumerate(counters)}
+            state.publish(values)
+        except SharedConfigError:
+            state.close()
+            state.unlink()
+            raise
+        return state
+
+    @classmethod
+    def attach(cls, name: str, slot: Optional[int] = None) -> "SharedState":
+        """
+        Attach to a block published by another process.
+
+        Args:
+            name: Segment name
+            slot: Counter row this process writes to (None for read-only counters)
+
+        Returns:
+            Attached shared state
+
+        Raises:
+            SharedConfigNotFoundError: If the block does not exist
+            SharedConfigError: If the block or slot is invalid
+        """
+        try:
+            shm = _attach_segment(name)
+        except FileNotFoundError as e:
+            raise SharedConfigNotFoundError(f"Shared config block not found: {name}") from e
+        return cls(shm, slot=slot)
+
+    @property
+    def name(self) -> str:
+        """Segment name."""
+        return self._shm.name
+
+    @property
+    def version(self) -> int:
+        """Current published version (odd while a reload is in progress)."""
+        version: int = struct.unpack_from("<Q", self._buf, VERSION_OFFSET)[0]
+        return version
+
+    def is_stale(self) -> bool:
+        """Whether the parent has published since this process last read."""
+        return self.version != self._version
+
+    def refresh(self) -> bool:
+        """
+        Re-read the payload if the version changed.
+
+        Returns:
+            True if a new snapshot was loaded
+
+        Raises:
+            SharedConfigError: If a consistent snapshot cannot be read
+        """
+        if not self.is_stale():
+            return False
+
+        buf = self._buf
+        for _ in range(READ_RETRIES):
+            before = self.version
+            if before % 2:
+                time.sleep(0)
+                continue
+            length = struct.unpack_from("<I", buf, LENGTH_OFFSET)[0]
+            raw = bytes(buf[self._payload_offset:self._payload_offset + length])
+            if self.version == before:
+                break
+        else:
+            raise SharedConfigError(f"Shared config block busy: {self.name}")
+
+        payload = json.loads(raw) if raw else {"values": {}, "counters": []}
+        self._values = payload["values"]
+        self._counter_index = {counter: i for i, counter in enumerate(payload["counters"])}
+        self._version = before
+        return True
+
+    def snapshot(self) -> dict[str, str]:
+        """
+        Get the current configuration snapshot, refreshing if stale.
+
+        Returns:
+            Configuration values (do not mutate)
+        """
+        self.refresh()
+        return self._values
+
+    def publish(self, values: Mapping[str, str]) -> int:
+        """
+        Publish a new configuration snapshot (owner only).
+
+        Args:
+            values: Configuration snapshot
+
+        Returns:
+            New version
+
+        Raises:
+            SharedConfigError: If not the owner or the payload does not fit
+        """
+        if not self._owner:
+            raise SharedConfigError("Only the creating process may publish")
+
+        payload = json.dumps(
+            {"values": dict(values), "counters": list(self._counter_index)},
+            separators=(",", ":"),
+        ).encode()
+        if self._payload_offset + len(payload) > self._shm.size:
+            raise SharedConfigError(
+                f"Config snapshot of {len(payload)} bytes exceeds shared block capacity"
+            )
+
+        with self._lock:
+            buf = self._buf
+            version = self.version
+            struct.pack_into("<Q", buf, VERSION_OFFSET, version + 1)
+            buf[self._payload_offset:self._payload_offset + len(payload)] = payload
+            struct.pack_into("<I", buf, LENGTH_OFFSET, len(payload))
+            struct.pack_into("<Q", buf, VERSION_OFFSET, version + 2)
+
+        self.refresh()
+        return version + 2
+
+    def _counter_slot(self, counter: str) -> int:
+        """Get the column index of a counter."""
+        index = self._counter_index.get(counter)
+        if index is None:
+            raise SharedConfigError(f"Unknown counter: {counter}")
+        return index
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """
+        Add to a counter in this process's slot.
+
+        Args:
+            counter: Counter name
+            amount: Amount to add
+
+        Raises:
+            SharedConfigError: If the counter is unknown or this process has no slot
+        """
+        if self._row is None:
+            raise SharedConfigError(
+                f"Counters are read-only without a slot (set {SHARED_CONFIG_SLOT_ENV})"
+            )
+        index = self._row + self._counter_slot(counter)
+        with self._lock:
+            self._counters[index] += amount
+
+    def counter(self, counter: str) -> int:
+        """
+        Get a counter summed across all slots.
+
+        Args:
+            counter: Counter name
+
+        Returns:
+            Counter total
+
+        Raises:
+            SharedConfigError: If the counter is unknown
+        """
+        index = self._counter_slot(counter)
+        width = len(self._counter_index)
+        return sum(self._counters[row * width + index] for row in range(self.slots))
+
+    def counters(self) -> dict[str, int]:
+        """
+        Get all counters summed across slots.
+
+        Returns:
+            Counter totals by name
+        """
+        return {counter: self.counter(counter) for counter in self._counter_index}
+
+    def _release(self) -> None:
+        """Release buffer views and close the segment."""
+        counters = getattr(self, "_counters", None)
+        if counters is not None:
+            counters.release()
+        self._shm.close()
+
+    def close(self) -> None:
+        """Detach from the block."""
+        self._release()
+
+    def unlink(self) -> None:
+        """
+        Destroy the block (owner only).
+
+        Also withdraws SPECIFY_SHARED_CONFIG if it still names this block, so
+        processes started afterwards parse their own configuration.
+
+        Raises:
+            SharedConfigError: If not the owner
+        """
+        if not self._owner:
+            raise SharedConfigError("Only the creating process may unlink")
+        if os.environ.get(SHARED_CONFIG_ENV) == self.name:
+            del os.environ[SHARED_CONFIG_ENV]
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedState":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
+
+
+class SharedConfig(Config):
+    """Configuration backed by a shared snapshot instead of the environment."""
+
+    def __init__(self, state: SharedState) -> None:
+        """
+        Initialize configuration.
+
+        Args:
+            state: Attached shared state
+        """
+        self.env_file = None
+        self.shared = state
+
+    def get(self, key: str, default: Optional[str] = None, required: bool = False) -> Optional[str]:
+        """
+        Get configuration value from the shared snapshot.
+
+        Args:
+            key: Configuration key
+            default: Default value if not found
+            required: Whether value is required
+
+        Returns:
+            Configuration value or default
+
+        Raises:
+            ConfigError: If required value is missing
+        """
+        value = self.shared.snapshot().get(key, default)
+
+        if required and value is None:
+            raise ConfigError(f"Required configuration missing: {key}")
+
+        return value
+
+
+def publish_config(
+    keys: Optional[Sequence[str]] = None,
+    counters: Sequence[str] = (),
+    slots: int = DEFAULT_SLOTS,
+    size: int = DEFAULT_SIZE,
+) -> SharedState:
+    """
+    Publish the current configuration for worker processes.
+
+    Snapshots the environment (after get_config() has loaded any .env file) and
+    exports the block name in SPECIFY_SHARED_CONFIG so child processes attach to
+    it from get_config(). Give each worker that increments counters its own
+    SPECIFY_SHARED_CONFIG_SLOT between 1 and slots - 1.
+
+    Args:
+        keys: Keys to publish (defaults to the whole environment)
+        counters: Counter names
+        slots: Number of counter rows (row 0 is the publisher's; the default
+            leaves one worker row per CPU)
+        size: Total block size in bytes
+
+    Returns:
+        Owning shared state
+    """
+    environ = os.environ
+    if keys is None:
+        excluded = {SHARED_CONFIG_ENV, SHARED_CONFIG_SLOT_ENV}
+        values = {key: value for key, value in environ.items() if key not in excluded}
+    else:
+        values = {key: environ[key] for key in keys if key in environ}
+
+    state = SharedState.create(values, counters=counters, slots=slots, size=size)
+    os.environ[SHARED_CONFIG_ENV] = state.name
+    return state
+
+
+def attach_config(name: Optional[str] = None, slot: Optional[int] = None) -> SharedConfig:
+    """
+    Attach to a published configuration.
+
+    Args:
+        name: Segment name (defaults to SPECIFY_SHARED_CONFIG)
+        slot: Counter row this process writes to (defaults to
+            SPECIFY_SHARED_CONFIG_SLOT; counters are read-only if neither is set)
+
+    Returns:
+        Shared configuration
+
+    Raises:
+        SharedConfigNotFoundError: If the named block no longer exists
+        SharedConfigError: If no block is published, the slot is invalid, or the
+            block cannot be attached
+    """
+    block = name or os.environ.get(SHARED_CONFIG_ENV)
+    if not block:
+        raise SharedConfigError(f"No shared config published ({SHARED_CONFIG_ENV} not set)")
+
+    if slot is None and os.environ.get(SHARED_CONFIG_SLOT_ENV):
+        slot_value = os.environ[SHARED_CONFIG_SLOT_ENV]
+        try:
+            slot = int(slot_value)
+        except ValueError as e:
+            raise SharedConfigError(
+                f"Invalid integer value for {SHARED_CONFIG_SLOT_ENV}: {slot_value}"
+            ) from e
+
+    return SharedConfig(SharedState.attach(block, slot=slot))
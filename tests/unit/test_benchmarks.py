@@ -0,0 +1,182 @@
+"""
+Unit tests for the benchmark suite.
+
+Tests that benchmarks run and that regression gating works.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.runner import (
+    TRACKED_METRIC,
+    BenchmarkError,
+    Comparison,
+    compare_results,
+    load_results,
+    main,
+    missing_benchmarks,
+    run_benchmark,
+    save_results,
+)
+from benchmarks.suite import BENCHMARKS, Benchmark
+
+
+def _results(**metrics):
+    """Build a results document with the given ns_per_item values."""
+    return {
+        "meta": {},
+        "benchmarks": {
+            name: {TRACKED_METRIC: value, "items_per_second": 1e9 / value}
+            for name, value in metrics.items()
+        },
+    }
+
+
+class TestSuite:
+    """Test benchmark definitions."""
+
+    def test_required_benchmarks_registered(self):
+        """Test the suite covers config, validation and logging."""
+        names = {bench.name for bench in BENCHMARKS}
+        assert {
+            "config.get",
+            "config.get_int",
+            "config.get_bool",
+            "config.get_path",
+            "validation.validate_string_pattern",
+            "validation.validate_memory_key",
+            "validation.validate_file_path",
+            "logging.events",
+        } <= names
+
+    @pytest.mark.parametrize("bench", BENCHMARKS, ids=lambda bench: bench.name)
+    def test_benchmark_runs(self, bench):
+        """Test each benchmark operation executes once without error."""
+        with bench.setup() as op:
+            op()
+
+    def test_run_benchmark_metrics(self):
+        """Test metrics are normalised per item."""
+        from contextlib import contextmanager
+
+        @contextmanager
+        def setup():
+            yield lambda: None
+
+        metrics = run_benchmark(Benchmark("noop", setup, items=10), repeat=2)
+        assert metrics[TRACKED_METRIC] > 0
+        assert metrics[TRACKED_METRIC] <= metrics["median_ns_per_item"]
+        assert metrics["items_per_second"] == pytest.approx(1e9 / metrics[TRACKED_METRIC])
+        assert metrics["items"] == 10
+        assert metrics["repeat"] == 2
+
+
+class TestComparison:
+    """Test baseline storage and regression gating."""
+
+    def test_comparison_regressed(self):
+        """Test relative change against the threshold."""
+        assert Comparison("a", 100.0, 125.0).change == pytest.approx(0.25)
+        assert Comparison("a", 100.0, 125.0).regressed(0.20)
+        assert not Comparison("a", 100.0, 115.0).regressed(0.20)
+        assert not Comparison("a", 100.0, 50.0).regressed(0.20)
+
+    def test_comparison_zero_baseline(self):
+        """Test a zero baseline does not divide by zero."""
+        assert Comparison("a", 0.0, 10.0).regressed(0.20)
+        assert Comparison("a", 0.0, 0.0).change == 0.0
+
+    def test_compare_results_skips_unmatched(self):
+        """Test benchmarks missing from either side are ignored."""
+        comparisons = compare_results(_results(a=100.0, b=10.0), _results(a=150.0, c=5.0))
+        assert comparisons == [Comparison("a", 100.0, 150.0)]
+        assert missing_benchmarks(_results(a=1.0, b=1.0, d=1.0), _results(a=1.0)) == ["b", "d"]
+
+    def test_save_and_load(self, tmp_path):
+        """Test results round-trip through JSON."""
+        path = tmp_path / "nested" / "baseline.json"
+        save_results(_results(a=100.0), path)
+        assert load_results(path) == _results(a=100.0)
+
+    def test_load_errors(self, tmp_path):
+        """Test missing and malformed baselines raise BenchmarkError."""
+        with pytest.raises(BenchmarkError, match="Cannot load"):
+            load_results(tmp_path / "missing.json")
+
+        bad = tmp_path / "bad.json"
+        bad.write_text("not json")
+        with pytest.raises(BenchmarkError, match="Cannot load"):
+            load_results(bad)
+
+        bad.write_text(json.dumps({"meta": {}}))
+        with pytest.raises(BenchmarkError, match="missing 'benchmarks'"):
+            load_results(bad)
+
+    def test_main_run(self, tmp_path, capsys):
+        """Test run stores a baseline only when given --output."""
+        output = tmp_path / "baseline.json"
+        with patch("benchmarks.runner.run_suite", return_value=_results(a=100.0)) as run:
+            assert main(["run", "--output", str(output), "--filter", "a", "--repeat", "1"]) == 0
+        run.assert_called_once_with(name_filter="a", repeat=1)
+        assert load_results(output) == _results(a=100.0)
+        assert "a" in capsys.readouterr().out
+
+    def test_main_run_prints_only(self, capsys):
+        """Test run without --output leaves the baseline untouched."""
+        with patch("benchmarks.runner.run_suite", return_value=_results(a=100.0)), \
+                patch("benchmarks.runner.save_results") as save:
+            assert main(["run"]) == 0
+        save.assert_not_called()
+        assert "a" in capsys.readouterr().out
+
+    def test_main_compare_passes(self, tmp_path, capsys):
+        """Test compare succeeds within the threshold and can save current results."""
+        baseline = tmp_path / "baseline.json"
+        current = tmp_path / "current.json"
+        save_results(_results(a=100.0), baseline)
+        with patch("benchmarks.runner.run_suite", return_value=_results(a=105.0)):
+            assert main(["compare", str(baseline), "--output", str(current)]) == 0
+        assert "+5.0%" in capsys.readouterr().out
+        assert load_results(current) == _results(a=105.0)
+
+    def test_main_compare_fails_on_regression(self, tmp_path, capsys):
+        """Test compare exits non-zero when a tracked metric regresses."""
+        baseline = tmp_path / "baseline.json"
+        save_results(_results(a=100.0, b=100.0), baseline)
+        with patch("benchmarks.runner.run_suite", return_value=_results(a=150.0, b=90.0)):
+            assert main(["compare", str(baseline), "--threshold", "0.1"]) == 1
+        captured = capsys.readouterr()
+        assert "REGRESSED" in captured.out
+        assert "1 benchmark(s) regressed by more than 10%: a" in captured.err
+
+    def test_main_compare_fails_on_missing_benchmark(self, tmp_path, capsys):
+        """Test baseline benchmarks that no longer run fail the gate."""
+        baseline = tmp_path / "baseline.json"
+        save_results(_results(a=100.0, removed=100.0), baseline)
+        with patch("benchmarks.runner.run_suite", return_value=_results(a=100.0)):
+            assert main(["compare", str(baseline)]) == 1
+        assert "1 baseline benchmark(s) did not run: removed" in capsys.readouterr().err
+
+    def test_main_compare_filter_allows_missing(self, tmp_path):
+        """Test filtered runs only gate the benchmarks they ran."""
+        baseline = tmp_path / "baseline.json"
+        save_results(_results(a=100.0, other=100.0), baseline)
+        with patch("benchmarks.runner.run_suite", return_value=_results(a=100.0)):
+            assert main(["compare", str(baseline), "--filter", "a"]) == 0
+
+    def test_main_compare_fails_when_nothing_compared(self, tmp_path, capsys):
+        """Test a filter matching no baseline benchmarks fails instead of passing."""
+        baseline = tmp_path / "baseline.json"
+        save_results(_results(a=100.0), baseline)
+        with patch("benchmarks.runner.run_suite", return_value=_results()):
+            assert main(["compare", str(baseline), "--filter", "nomatch"]) == 1
+        assert "No benchmarks in common" in capsys.readouterr().err
+
+    def test_main_compare_missing_baseline(self, tmp_path, capsys):
+        """Test compare fails before running when the baseline is missing."""
+        with patch("benchmarks.runner.run_suite") as run:
+            assert main(["compare", str(tmp_path / "missing.json")]) == 1
+        run.assert_not_called()
+        assert "Cannot load" in capsys.readouterr().err
@@ -26,6 +26,16 @@ from src.utils.validation import (
 class TestLogging:
     """Test logging utilities."""
     
+    @pytest.fixture(autouse=True)
+    def fresh_process_correlation(self, monkeypatch):
+        """Give each test its own process root correlation ID."""
+        from src.utils import logging as logging_module
+        
+        monkeypatch.delenv(logging_module.CORRELATION_ID_ENV, raising=False)
+        monkeypatch.setattr(
+            logging_module, "_process_correlation", logging_module._ProcessCorrelation()
+        )
+    
     def test_configure_logging(self):
         """Test logging configuration."""
         configure_logging()
@@ -89,6 +99,183 @@ class TestLogging:
         result = add_correlation_id(logger, "info", event_dict)
         
         assert result["correlation_id"] == existing_id
+    
+    def test_add_correlation_id_inherited(self, monkeypatch):
+        """Test the correlation ID inherited from a parent process is reused."""
+        from src.utils.logging import CORRELATION_ID_ENV, add_correlation_id
+        
+        monkeypatch.setenv(CORRELATION_ID_ENV, "parent-id")
+        result = add_correlation_id(None, "info", {"event": "test_event"})
+        assert result["correlation_id"] == "parent-id"
+    
+    def test_add_correlation_id_groups_unscoped_events(self):
+        """Test events outside any scope share the process root ID."""
+        from src.utils.logging import add_correlation_id, process_correlation_id
+        
+        first = add_correlation_id(None, "info", {"event": "first"})
+        second = add_correlation_id(None, "info", {"event": "second"})
+        assert first["correlation_id"] == second["correlation_id"] == process_correlation_id()
+    
+    def test_new_correlation_id_time_ordered(self):
+        """Test generated IDs are UUIDv7-style and sort by creation time."""
+        import time
+        import uuid
+        
+        from src.utils.logging import new_correlation_id
+        
+        first = new_correlation_id()
+        time.sleep(0.002)
+        second = new_correlation_id()
+        
+        parsed = uuid.UUID(first)
+        assert parsed.version == 7
+        assert parsed.variant == uuid.RFC_4122
+        assert first < second
+        assert abs((parsed.int >> 80) - time.time_ns() // 1_000_000) < 60_000
+    
+    def test_correlation_scope(self):
+        """Test one ID is bound for the scope and removed afterwards."""
+        from src.utils.logging import correlation_scope, get_correlation_id
+        
+        assert get_correlation_id() is None
+        with correlation_scope() as correlation_id:
+            assert get_correlation_id() == correlation_id
+            with correlation_scope("nested") as nested:
+                assert nested == "nested"
+                assert get_correlation_id() == "nested"
+            assert get_correlation_id() == correlation_id
+        assert get_correlation_id() is None
+    
+    def test_nested_correlation_scope_keeps_id(self):
+        """Test a nested scope without an argument keeps the enclosing ID."""
+        from src.utils.logging import correlation_scope
+        
+        with correlation_scope() as outer:
+            with correlation_scope() as inner:
+                assert inner == outer
+        with correlation_scope() as unrelated:
+            assert unrelated != outer
+    
+    def test_correlation_scope_claims_inherited_id_once(self, monkeypatch):
+        """Test only the first top-level scope reuses the parent's ID."""
+        from src.utils.logging import CORRELATION_ID_ENV, correlation_scope, process_correlation_id
+        
+        monkeypatch.setenv(CORRELATION_ID_ENV, "parent-id")
+        with correlation_scope() as first:
+            with correlation_scope() as nested:
+                pass
+        with correlation_scope() as later:
+            pass
+        assert first == nested == "parent-id"
+        assert later != "parent-id"
+        assert process_correlation_id() == "parent-id"
+    
+    def test_correlation_scope_log_events(self, capsys):
+        """Test all events logged within a scope share one ID."""
+        import json
+        
+        from src.utils.logging import correlation_scope
+        
+        configure_logging()
+        logger = get_logger("test_scope")
+        with correlation_scope() as correlation_id:
+            logger.info("first")
+            logger.info("second")
+        
+        events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [event["correlation_id"] for event in events] == [correlation_id] * 2
+    
+    def test_bind_correlation_id(self, monkeypatch):
+        """Test binding explicit, bound, inherited and generated IDs."""
+        from src.utils.logging import CORRELATION_ID_ENV, bind_correlation_id, get_correlation_id
+        
+        monkeypatch.setenv(CORRELATION_ID_ENV, "inherited")
+        try:
+            assert bind_correlation_id("explicit") == "explicit"
+            assert get_correlation_id() == "explicit"
+            assert bind_correlation_id() == "explicit"
+            
+            structlog.contextvars.clear_contextvars()
+            assert bind_correlation_id() == "inherited"
+            
+            structlog.contextvars.clear_contextvars()
+            generated = bind_correlation_id()
+            assert generated not in {"explicit", "inherited"}
+            assert get_correlation_id() == generated
+        finally:
+            structlog.contextvars.clear_contextvars()
+    
+    def test_correlation_id_thread_pool(self):
+        """Test thread-pool tasks inherit the submitting scope's ID."""
+        from src.utils.logging import (
+            ContextThreadPoolExecutor,
+            correlation_scope,
+            get_correlation_id,
+        )
+        
+        def open_scope():
+            with correlation_scope() as task_id:
+                return task_id
+        
+        with ContextThreadPoolExecutor(max_workers=2) as executor:
+            with correlation_scope() as correlation_id:
+                futures = [executor.submit(get_correlation_id) for _ in range(4)]
+                futures.append(executor.submit(open_scope))
+            assert [f.result() for f in futures] == [correlation_id] * 5
+            assert executor.submit(get_correlation_id).result() is None
+    
+    def test_correlation_id_asyncio_tasks(self):
+        """Test asyncio tasks inherit the scope's ID."""
+        import asyncio
+        
+        from src.utils.logging import correlation_scope, get_correlation_id
+        
+        async def read_in_task():
+            await asyncio.sleep(0)
+            return get_correlation_id()
+        
+        async def handle_request():
+            with correlation_scope() as correlation_id:
+                tasks = [asyncio.create_task(read_in_task()) for _ in range(3)]
+            # Tasks first run after the scope has exited in this coroutine
+            assert get_correlation_id() is None
+            results = await asyncio.gather(*tasks)
+            with correlation_scope() as other_id:
+                results.append(await asyncio.to_thread(get_correlation_id))
+            return correlation_id, other_id, results
+        
+        correlation_id, other_id, results = asyncio.run(handle_request())
+        assert results == [correlation_id] * 3 + [other_id]
+    
+    def test_correlation_id_subprocess(self):
+        """Test child processes inherit the ID through the environment."""
+        import subprocess
+        import sys
+        
+        from src.utils.logging import correlation_env, correlation_scope
+        
+        code = (
+            "from src.utils.logging import correlation_scope\n"
+            "with correlation_scope() as correlation_id: print(correlation_id)"
+        )
+        with correlation_scope() as correlation_id:
+            result = subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+                env=correlation_env(),
+                cwd=Path(__file__).parents[2],
+            )
+        assert result.stdout.strip() == correlation_id
+    
+    def test_correlation_env(self):
+        """Test correlation_env only sets the ID when a scope is active."""
+        from src.utils.logging import CORRELATION_ID_ENV, correlation_env, correlation_scope
+        
+        assert CORRELATION_ID_ENV not in correlation_env({"PATH": "/bin"})
+        with correlation_scope("abc"):
+            assert correlation_env({"PATH": "/bin"}) == {"PATH": "/bin", CORRELATION_ID_ENV: "abc"}
 
 
 class TestValidation:
@@ -353,3 +540,766 @@ class TestConfig:
         config = Config()
         with pytest.raises(ConfigError, match="Required configuration missing"):
             config.get_path("NONEXISTENT_PATH", required=True)
+
+
+class TestHelperDaemon:
+    """Test the warm helper daemon and its client."""
+    
+    @pytest.fixture
+    def git_repo(self, tmp_path):
+        """Create a git repository on a feature branch with one spec directory."""
+        import subprocess
+        
+        subprocess.run(["git", "init", "-q", "-b", "003-my-feature", str(tmp_path)], check=True)
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q",
+             "--allow-empty", "-m", "init"],
+            cwd=tmp_path,
+            check=True,
+        )
+        (tmp_path / "specs" / "003-my-feature").mkdir(parents=True)
+        return tmp_path
+    
+    @pytest.fixture
+    def running_daemon(self, tmp_path):
+        """Start a helper daemon on a temporary socket."""
+        import threading
+        
+        from src.utils.daemon import HelperDaemon
+        
+        server = HelperDaemon(tmp_path / "helper.sock")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+    
+    def test_default_socket_path(self, monkeypatch):
+        """Test socket path defaults to a private directory and honours overrides."""
+        from src.utils.daemon import default_socket_path
+        
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        path = default_socket_path()
+        assert path.name == "helper.sock"
+        assert path.parent.name == f"specify-helper-{os.getuid()}"
+        
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert default_socket_path() == Path("/run/user/1000/specify-helper.sock")
+        
+        monkeypatch.setenv("SPECIFY_HELPER_SOCKET", "/tmp/custom.sock")
+        assert default_socket_path() == Path("/tmp/custom.sock").resolve()
+    
+    @staticmethod
+    def _foreign_owner(*foreign_paths):
+        """Patch os.stat so the given paths appear to belong to another user."""
+        real_stat = os.stat
+        foreign = {Path(path) for path in foreign_paths}
+        
+        def fake_stat(path, *args, **kwargs):
+            result = real_stat(path, *args, **kwargs)
+            if Path(path) in foreign:
+                fields = list(result[:10])
+                fields[4] = os.getuid() + 1
+                return os.stat_result(fields)
+            return result
+        
+        return patch("src.utils.daemon.os.stat", side_effect=fake_stat)
+    
+    def test_daemon_creates_private_socket_dir(self, tmp_path):
+        """Test the daemon creates a mode-0700 directory for its socket."""
+        from src.utils.daemon import HelperDaemon
+        
+        server = HelperDaemon(tmp_path / "private" / "helper.sock")
+        try:
+            assert (tmp_path / "private").stat().st_mode & 0o777 == 0o700
+        finally:
+            server.server_close()
+    
+    def test_daemon_rejects_foreign_socket_dir(self, tmp_path):
+        """Test the daemon refuses a socket directory owned by another user."""
+        from src.utils.daemon import DaemonError, HelperDaemon
+        
+        with self._foreign_owner(tmp_path), pytest.raises(DaemonError, match="owned by uid"):
+            HelperDaemon(tmp_path / "helper.sock")
+        assert not (tmp_path / "helper.sock").exists()
+    
+    def test_daemon_rejects_foreign_socket(self, tmp_path):
+        """Test the daemon refuses to reuse a socket owned by another user."""
+        import socket
+        
+        from src.utils.daemon import DaemonError, HelperDaemon
+        
+        path = tmp_path / "helper.sock"
+        planted = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        planted.bind(str(path))
+        planted.close()
+        
+        with self._foreign_owner(path), pytest.raises(DaemonError, match="owned by uid"):
+            HelperDaemon(path)
+        assert path.is_socket()
+    
+    def test_client_rejects_foreign_socket(self, running_daemon):
+        """Test the client never talks to a socket or directory owned by another user."""
+        from src.utils.daemon import DaemonError, HelperClient, _connect
+        
+        path = running_daemon.socket_path
+        for foreign in (path, path.parent):
+            client = HelperClient(path)
+            with self._foreign_owner(foreign):
+                with pytest.raises(DaemonError, match="owned by uid"):
+                    _connect(path)
+                assert client.request("ping") == "pong"
+            # The request was served in-process rather than by the untrusted socket
+            assert client._local is not None
+    
+    def test_feature_paths_git_repo(self, git_repo):
+        """Test feature paths resolve by numeric prefix in a git repo."""
+        from src.utils.daemon import HelperState
+        
+        paths = HelperState().dispatch("feature_paths", {"cwd": str(git_repo)})
+        
+        assert paths["REPO_ROOT"] == str(git_repo.resolve())
+        assert paths["CURRENT_BRANCH"] == "003-my-feature"
+        assert paths["HAS_GIT"] == "true"
+        assert paths["FEATURE_DIR"] == str(git_repo.resolve() / "specs" / "003-my-feature")
+        assert paths["IMPL_PLAN"].endswith("003-my-feature/plan.md")
+    
+    def test_feature_paths_specify_feature_override(self, git_repo):
+        """Test SPECIFY_FEATURE takes precedence over git."""
+        from src.utils.daemon import HelperState
+        
+        paths = HelperState().dispatch(
+            "feature_paths", {"cwd": str(git_repo), "specify_feature": "other"}
+        )
+        assert paths["CURRENT_BRANCH"] == "other"
+        assert paths["FEATURE_DIR"].endswith("specs/other")
+    
+    def test_branch_cache_invalidated_by_head(self, git_repo):
+        """Test cached branch is reused until HEAD changes."""
+        import subprocess
+        
+        from src.utils.daemon import HelperState
+        
+        state = HelperState()
+        repo = state.repo(git_repo)
+        assert state.repo(str(git_repo)) is repo
+        assert repo.has_git
+        
+        assert repo.branch() == "003-my-feature"
+        with patch("src.utils.daemon._git") as mock_git:
+            assert repo.branch() == "003-my-feature"
+            mock_git.assert_not_called()
+        
+        subprocess.run(["git", "checkout", "-q", "-b", "004-next"], cwd=git_repo, check=True)
+        os.utime(git_repo / ".git" / "HEAD", ns=(0, 0))
+        assert repo.branch() == "004-next"
+        
+        state.dispatch("invalidate", {})
+        assert state.repo(git_repo) is not repo
+    
+    def test_branch_head_missing(self, git_repo):
+        """Test branch lookup when HEAD cannot be stat'ed."""
+        from src.utils.daemon import RepoState
+        
+        repo = RepoState(git_repo)
+        repo._head_path = git_repo / "missing"
+        assert repo.branch() == "003-my-feature"
+        repo._head_path = None
+        assert repo.branch() == "003-my-feature"
+    
+    def test_feature_paths_non_git(self, tmp_path):
+        """Test non-git repos fall back to the highest numbered spec directory."""
+        from src.utils.daemon import RepoState
+        
+        specs = tmp_path / "specs"
+        for name in ("001-first", "010-latest", "005-middle", "notes"):
+            (specs / name).mkdir(parents=True)
+        (specs / "020-file.md").touch()
+        
+        with patch("src.utils.daemon._git", return_value=None):
+            repo = RepoState(tmp_path / "specs", fallback_root=tmp_path)
+            assert not repo.has_git
+            assert repo.branch() == "010-latest"
+            assert repo.root == tmp_path
+    
+    def test_non_git_root_matches_scripts(self, tmp_path):
+        """Test non-git repos use the scripts' checkout as root, not the cwd."""
+        from src.utils.daemon import DEFAULT_FALLBACK_ROOT, HelperState
+        
+        assert (DEFAULT_FALLBACK_ROOT / ".specify" / "scripts" / "bash" / "common.sh").exists()
+        
+        state = HelperState()
+        paths = state.dispatch("feature_paths", {"cwd": str(tmp_path), "specify_feature": "x"})
+        assert paths["REPO_ROOT"] == str(DEFAULT_FALLBACK_ROOT)
+        assert paths["HAS_GIT"] == "false"
+        
+        other_root = tmp_path / "checkout"
+        other_root.mkdir()
+        paths = state.dispatch(
+            "feature_paths",
+            {"cwd": str(tmp_path), "fallback_root": str(other_root), "specify_feature": "x"},
+        )
+        assert paths["REPO_ROOT"] == str(other_root)
+    
+    def test_feature_paths_non_git_no_specs(self, tmp_path):
+        """Test non-git repos without specs fall back to main."""
+        from src.utils.daemon import RepoState
+        
+        with patch("src.utils.daemon._git", return_value=None):
+            repo = RepoState(tmp_path, fallback_root=tmp_path)
+            assert repo.branch() == "main"
+            assert repo.feature_dir("001-x") == tmp_path / "specs" / "001-x"
+    
+    def test_feature_dir_multiple_matches(self, git_repo):
+        """Test ambiguous prefixes are errors so scripts fall back and report them."""
+        import json
+        
+        from src.utils.daemon import DaemonError, HelperState, RepoState, handle_request
+        
+        (git_repo / "specs" / "003-duplicate").mkdir()
+        repo = RepoState(git_repo)
+        with pytest.raises(DaemonError, match="Multiple spec directories found with prefix '003'"):
+            repo.feature_dir("003-my-feature")
+        assert repo.feature_dir("no-prefix") == repo.root / "specs" / "no-prefix"
+        
+        line = json.dumps(
+            {"op": "feature_paths", "raw": True, "args": {"cwd": str(git_repo), "format": "shell"}}
+        ).encode()
+        response = handle_request(HelperState(), line)
+        assert response["ok"] is False
+        assert response["raw"] is True
+    
+    def test_git_unavailable(self, tmp_path):
+        """Test git failures and a missing git binary are treated as a non-git repo."""
+        from src.utils.daemon import _git
+        
+        assert _git(tmp_path, "rev-parse", "--show-toplevel") is None
+        with patch("src.utils.daemon.subprocess.run", side_effect=OSError):
+            assert _git(tmp_path, "status") is None
+    
+    def test_feature_paths_shell_format(self, git_repo):
+        """Test shell-format output can be eval'ed like get_feature_paths."""
+        from src.utils.daemon import HelperState, format_shell_assignments
+        
+        output = HelperState().dispatch(
+            "feature_paths", {"cwd": str(git_repo), "format": "shell"}
+        )
+        assert f"REPO_ROOT='{git_repo.resolve()}'\n" in output
+        assert format_shell_assignments({"A": "it's"}) == "A='it'\\''s'\n"
+    
+    def test_dispatch_validation_ops(self, tmp_path):
+        """Test validation operations; config lookups stay in the caller's process."""
+        from src.utils.daemon import DaemonError, HelperState
+        
+        state = HelperState()
+        key = "myrepo:main:feature:patterns"
+        assert state.dispatch("ping", {}) == "pong"
+        assert state.dispatch("validate_memory_key", {"key": key}) == key
+        assert state.dispatch(
+            "validate_file_path", {"path": str(tmp_path), "must_be_file": False}
+        ) == str(tmp_path)
+        with pytest.raises(DaemonError, match="Unknown operation"):
+            state.dispatch("config_get", {"key": "NONEXISTENT"})
+    
+    def test_validate_file_path_uses_caller_cwd(self, running_daemon, tmp_path, monkeypatch):
+        """Test relative paths resolve against the caller's cwd with or without the daemon."""
+        from src.utils.daemon import HelperClient
+        
+        (tmp_path / "plan.md").touch()
+        monkeypatch.chdir(tmp_path)
+        
+        remote = HelperClient(running_daemon.socket_path)
+        local = HelperClient(tmp_path / "absent.sock")
+        for client in (remote, local):
+            assert client.request("validate_file_path", path="plan.md") == "plan.md"
+            with pytest.raises(ValidationError, match=f"File not found: {tmp_path}/missing.md"):
+                client.request("validate_file_path", path="missing.md")
+        assert local._local is not None
+        assert remote._local is None
+    
+    def test_handle_request_errors(self):
+        """Test errors are encoded in the response."""
+        from src.utils.daemon import HelperState, handle_request
+        
+        state = HelperState()
+        
+        response = handle_request(state, b'{"op": "validate_memory_key", "args": {"key": "x"}}')
+        assert response["ok"] is False
+        assert response["type"] == "ValidationError"
+        
+        response = handle_request(state, b'{"op": "nope"}')
+        assert response["type"] == "DaemonError"
+        assert "Unknown operation" in response["error"]
+        
+        response = handle_request(state, b"not json")
+        assert response["type"] == "DaemonError"
+        assert "Bad request" in response["error"]
+        
+        response = handle_request(state, b'{"op": "ping", "raw": true}')
+        assert response == {"ok": True, "raw": True, "result": "pong"}
+    
+    def test_client_via_daemon(self, running_daemon, git_repo):
+        """Test client requests are served by the running daemon."""
+        from src.utils.daemon import HelperClient
+        
+        client = HelperClient(running_daemon.socket_path)
+        assert client.request("ping") == "pong"
+        paths = client.request("feature_paths", cwd=str(git_repo))
+        assert paths["CURRENT_BRANCH"] == "003-my-feature"
+        assert client._local is None
+        assert running_daemon.state.repo(git_repo).branch() == "003-my-feature"
+        
+        with pytest.raises(ValidationError, match="Memory key must have format"):
+            client.request("validate_memory_key", key="bad")
+    
+    def test_daemon_raw_requests(self, running_daemon):
+        """Test raw requests return bare strings, and nothing on error."""
+        import socket
+        
+        def send(payload):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(str(running_daemon.socket_path))
+                sock.sendall(payload)
+                sock.shutdown(socket.SHUT_WR)
+                return sock.makefile("rb").read()
+        
+        assert send(b'{"op": "ping", "raw": true}\n') == b"pong"
+        assert send(b'{"op": "nope", "raw": true}\n') == b""
+        assert send(b"") == b""
+    
+    def test_client_fallback(self, tmp_path):
+        """Test client executes in-process when no daemon is listening."""
+        from src.utils.daemon import DaemonError, HelperClient
+        
+        client = HelperClient(tmp_path / "absent.sock")
+        assert client.request("ping") == "pong"
+        assert client.request("ping") == "pong"
+        with pytest.raises(DaemonError, match="Unknown operation"):
+            client.request("nope")
+    
+    def test_client_fallback_on_broken_connection(self, tmp_path):
+        """Test client falls back when the daemon drops or errors mid-request."""
+        from src.utils.daemon import HelperClient
+        
+        client = HelperClient(tmp_path / "absent.sock")
+        sock = patch("src.utils.daemon._connect")
+        with sock as mock_connect:
+            stream = mock_connect.return_value.makefile.return_value.__enter__.return_value
+            stream.readline.return_value = b""
+            assert client.request("ping") == "pong"
+            stream.readline.side_effect = OSError
+            assert client.request("ping") == "pong"
+    
+    def test_daemon_already_running(self, running_daemon):
+        """Test a second daemon refuses to steal a live socket."""
+        from src.utils.daemon import DaemonError, HelperDaemon
+        
+        with pytest.raises(DaemonError, match="already running"):
+            HelperDaemon(running_daemon.socket_path)
+    
+    def test_daemon_replaces_stale_socket(self, tmp_path):
+        """Test a stale socket file is removed on startup."""
+        import socket
+        
+        from src.utils.daemon import HelperDaemon
+        
+        path = tmp_path / "stale.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+        
+        server = HelperDaemon(path)
+        try:
+            assert path.is_socket()
+        finally:
+            server.server_close()
+        assert not path.exists()
+    
+    def test_main_usage(self):
+        """Test CLI usage errors."""
+        from src.utils.daemon import main
+        
+        assert main([]) == 2
+        assert main(["bogus"]) == 2
+        assert main(["call"]) == 2
+    
+    def test_main_client_commands(self, tmp_path, git_repo, capsys, monkeypatch):
+        """Test CLI client commands with in-process fallback."""
+        from src.utils.daemon import main
+        
+        monkeypatch.setenv("SPECIFY_HELPER_SOCKET", str(tmp_path / "absent.sock"))
+        monkeypatch.chdir(git_repo)
+        
+        assert main(["feature-paths"]) == 0
+        assert "CURRENT_BRANCH='003-my-feature'" in capsys.readouterr().out
+        
+        assert main(["call", "ping"]) == 0
+        assert capsys.readouterr().out == '"pong"\n'
+        
+        assert main(["call", "validate_memory_key", '{"key": "bad"}']) == 1
+        assert "Memory key must have format" in capsys.readouterr().err
+        
+        assert main(["call", "ping", "not json"]) == 1
+    
+    def test_main_serve(self, tmp_path, monkeypatch):
+        """Test serve command runs until interrupted and cleans up its socket."""
+        from src.utils.daemon import HelperDaemon, main
+        
+        socket_path = tmp_path / "serve.sock"
+        monkeypatch.setenv("SPECIFY_HELPER_SOCKET", str(socket_path))
+        with patch.object(HelperDaemon, "serve_forever", side_effect=KeyboardInterrupt), \
+                patch("src.utils.daemon.signal.signal") as mock_signal:
+            assert main(["serve"]) == 0
+            handler = mock_signal.call_args.args[1]
+        
+        assert not socket_path.exists()
+        with pytest.raises(SystemExit):
+            handler(None, None)
+    
+    def test_main_default_argv(self, monkeypatch):
+        """Test main reads sys.argv when no arguments are given."""
+        from src.utils.daemon import main
+        
+        monkeypatch.setattr("sys.argv", ["daemon.py"])
+        assert main() == 2
+
+
+def _shared_config_worker(slot, results):
+    """Attach to the published config from a worker process and bump a counter."""
+    from src.utils.shared_config import attach_config
+    
+    config = attach_config(slot=slot)
+    state = config.shared
+    for _ in range(100):
+        state.increment("requests")
+    results.put((config.get("SHARED_TEST_VALUE"), state.version))
+    state.close()
+
+
+class TestSharedConfig:
+    """Test shared-memory config and counters."""
+    
+    @pytest.fixture
+    def shared_state(self):
+        """Create a shared state block and destroy it afterwards."""
+        from src.utils.shared_config import SharedState
+        
+        state = SharedState.create({"A": "1"}, counters=["requests", "errors"], slots=4)
+        try:
+            yield state
+        finally:
+            state.close()
+            state.unlink()
+    
+    @pytest.fixture
+    def clean_shared_env(self, monkeypatch):
+        """Reset the config singleton and shared config env var around a test."""
+        from src.utils import config as config_module
+        from src.utils.config import SHARED_CONFIG_ENV
+        
+        monkeypatch.delenv(SHARED_CONFIG_ENV, raising=False)
+        monkeypatch.setattr(config_module, "_config", None)
+        yield
+        os.environ.pop(SHARED_CONFIG_ENV, None)
+    
+    def test_attach_reads_snapshot(self, shared_state):
+        """Test attached state sees the published snapshot."""
+        from src.utils.shared_config import SharedState
+        
+        attached = SharedState.attach(shared_state.name, slot=1)
+        try:
+            assert attached.snapshot() == {"A": "1"}
+            assert attached.version == shared_state.version == 2
+            assert not attached.is_stale()
+            assert attached.refresh() is False
+        finally:
+            attached.close()
+    
+    def test_reload_bumps_version(self, shared_state):
+        """Test attached readers detect reloads via the version stamp."""
+        from src.utils.shared_config import SharedState
+        
+        attached = SharedState.attach(shared_state.name)
+        try:
+            assert shared_state.publish({"A": "2", "B": "x"}) == 4
+            assert attached.is_stale()
+            assert attached.snapshot() == {"A": "2", "B": "x"}
+            assert not attached.is_stale()
+        finally:
+            attached.close()
+    
+    def test_counters_sum_across_slots(self, shared_state):
+        """Test per-slot counters are summed by readers."""
+        from src.utils.shared_config import SharedState
+        
+        attached = SharedState.attach(shared_state.name, slot=3)
+        try:
+            shared_state.increment("requests")
+            attached.increment("requests", 5)
+            attached.increment("errors")
+            assert shared_state.counter("requests") == 6
+            assert shared_state.counters() == {"requests": 6, "errors": 1}
+        finally:
+            attached.close()
+    
+    def test_counters_across_processes(self, shared_state):
+        """Test forked workers write to the parent's counters."""
+        import multiprocessing
+        
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        os.environ["SHARED_TEST_VALUE"] = "from-parent"
+        try:
+            from src.utils.shared_config import publish_config
+            
+            state = publish_config(keys=["SHARED_TEST_VALUE"], counters=["requests"], slots=3)
+            workers = [
+                ctx.Process(target=_shared_config_worker, args=(slot, results))
+                for slot in (1, 2)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            
+            assert [results.get(timeout=5) for _ in workers] == [("from-parent", 2)] * 2
+            assert state.counter("requests") == 200
+        finally:
+            del os.environ["SHARED_TEST_VALUE"]
+            os.environ.pop("SPECIFY_SHARED_CONFIG", None)
+            state.close()
+            state.unlink()
+    
+    def test_independent_process_does_not_unlink(self, shared_state):
+        """Test an unrelated process attaching leaves the block alive on exit."""
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys; from src.utils.shared_config import SharedState; "
+            "s = SharedState.attach(sys.argv[1], slot=1); s.increment('errors'); "
+            "print(s.snapshot()['A']); s.close()"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, shared_state.name],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parents[2],
+        )
+        assert result.stdout.strip() == "1"
+        assert "leaked" not in result.stderr
+        assert shared_state.counter("errors") == 1
+    
+    def test_attach_unregisters_from_own_tracker(self):
+        """Test attaching without an inherited tracker drops the tracker registration."""
+        from multiprocessing import resource_tracker
+        
+        from src.utils.shared_config import _attach_segment
+        
+        with patch.object(resource_tracker._resource_tracker, "_fd", None), \
+                patch("src.utils.shared_config.SharedMemory") as mock_shm, \
+                patch.object(resource_tracker, "unregister") as mock_unregister:
+            _attach_segment("block")
+        mock_unregister.assert_called_once_with(mock_shm.return_value._name, "shared_memory")
+    
+    def test_errors(self, shared_state):
+        """Test invalid usage raises SharedConfigError."""
+        from multiprocessing.shared_memory import SharedMemory
+        
+        from src.utils.config import ConfigError
+        from src.utils.shared_config import (
+            SharedConfigError,
+            SharedConfigNotFoundError,
+            SharedState,
+        )
+        
+        assert issubclass(SharedConfigError, ConfigError)
+        with pytest.raises(SharedConfigError, match="Unknown counter"):
+            shared_state.increment("missing")
+        with pytest.raises(SharedConfigError, match="out of range"):
+            SharedState.attach(shared_state.name, slot=4)
+        with pytest.raises(SharedConfigError, match="belongs to the publishing process"):
+            SharedState.attach(shared_state.name, slot=0)
+        with pytest.raises(SharedConfigNotFoundError, match="not found"):
+            SharedState.attach("definitely-not-a-block")
+        with pytest.raises(SharedConfigError, match="At least one counter slot"):
+            SharedState.create({}, slots=0)
+        with pytest.raises(SharedConfigError, match="too small for counters"):
+            SharedState.create({}, counters=["a"] * 10, size=64)
+        with pytest.raises(SharedConfigError, match="exceeds shared block capacity"):
+            SharedState.create({"big": "x" * 200}, size=128)
+        
+        attached = SharedState.attach(shared_state.name)
+        try:
+            with pytest.raises(SharedConfigError, match="Only the creating process may publish"):
+                attached.publish({})
+            with pytest.raises(SharedConfigError, match="Only the creating process may unlink"):
+                attached.unlink()
+        finally:
+            attached.close()
+        
+        foreign = SharedMemory(create=True, size=64)
+        try:
+            with pytest.raises(SharedConfigError, match="Not a shared config block"):
+                SharedState.attach(foreign.name)
+        finally:
+            foreign.close()
+            foreign.unlink()
+    
+    def test_refresh_busy(self, shared_state):
+        """Test readers give up if a reload never completes."""
+        import struct
+        
+        from src.utils.shared_config import VERSION_OFFSET, SharedConfigError, SharedState
+        
+        attached = SharedState.attach(shared_state.name)
+        struct.pack_into("<Q", shared_state._shm.buf, VERSION_OFFSET, 5)
+        try:
+            with patch("src.utils.shared_config.READ_RETRIES", 3):
+                with pytest.raises(SharedConfigError, match="busy"):
+                    attached.refresh()
+        finally:
+            attached.close()
+    
+    def test_counters_read_only_without_slot(self, shared_state):
+        """Test workers attached without a slot cannot write to the publisher's row."""
+        from src.utils.shared_config import SharedConfigError, SharedState
+        
+        attached = SharedState.attach(shared_state.name)
+        try:
+            assert attached.slot is None
+            with pytest.raises(SharedConfigError, match="read-only without a slot"):
+                attached.increment("requests")
+            shared_state.increment("requests")
+            assert attached.counter("requests") == 1
+        finally:
+            attached.close()
+    
+    def test_attach_config_slot_from_env(self, shared_state, clean_shared_env, monkeypatch):
+        """Test get_config-attached workers take their counter row from the environment."""
+        from src.utils.config import get_config
+        from src.utils.shared_config import (
+            SHARED_CONFIG_SLOT_ENV,
+            SharedConfigError,
+            attach_config,
+        )
+        
+        monkeypatch.setenv("SPECIFY_SHARED_CONFIG", shared_state.name)
+        monkeypatch.setenv(SHARED_CONFIG_SLOT_ENV, "2")
+        config = get_config()
+        try:
+            assert config.shared.slot == 2
+            config.shared.increment("requests", 3)
+            assert shared_state._counters[2 * 2] == 3
+        finally:
+            config.shared.close()
+        
+        monkeypatch.setenv(SHARED_CONFIG_SLOT_ENV, "two")
+        with pytest.raises(SharedConfigError, match="Invalid integer value"):
+            attach_config()
+    
+    def test_unlink_withdraws_env(self, clean_shared_env):
+        """Test children started after the block is gone parse their own config."""
+        import subprocess
+        import sys
+        
+        from src.utils.shared_config import publish_config
+        
+        with publish_config() as state:
+            assert os.environ["SPECIFY_SHARED_CONFIG"] == state.name
+        assert "SPECIFY_SHARED_CONFIG" not in os.environ
+        
+        code = "from src.utils.config import get_config; print(type(get_config()).__name__)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parents[2],
+        )
+        assert result.stdout.strip() == "Config"
+    
+    def test_get_config_falls_back_when_block_gone(self, clean_shared_env, monkeypatch):
+        """Test get_config parses normally, with a warning, if the block was removed."""
+        from src.utils.config import get_config
+        from src.utils.shared_config import SharedConfig
+        
+        monkeypatch.setenv("SPECIFY_SHARED_CONFIG", "definitely-not-a-block")
+        with patch("src.utils.config.get_logger") as mock_get_logger:
+            config = get_config()
+        assert type(config) is Config
+        assert not isinstance(config, SharedConfig)
+        mock_get_logger.return_value.warning.assert_called_once()
+        assert mock_get_logger.return_value.warning.call_args.args[0] == "shared_config_unavailable"
+    
+    def test_get_config_raises_on_bad_slot(self, clean_shared_env, monkeypatch):
+        """Test a misconfigured worker slot fails instead of silently re-parsing."""
+        from src.utils.config import get_config
+        from src.utils.shared_config import (
+            SHARED_CONFIG_SLOT_ENV,
+            SharedConfigError,
+            publish_config,
+        )
+        
+        with publish_config(slots=2):
+            monkeypatch.setenv(SHARED_CONFIG_SLOT_ENV, "2")
+            with pytest.raises(SharedConfigError, match="out of range"):
+                get_config()
+    
+    def test_default_slots_cover_worker_pool(self, clean_shared_env, monkeypatch):
+        """Test the default layout has a counter row for each CPU's worker."""
+        from src.utils.shared_config import (
+            DEFAULT_SLOTS,
+            SHARED_CONFIG_SLOT_ENV,
+            attach_config,
+            publish_config,
+        )
+        
+        assert DEFAULT_SLOTS == (os.cpu_count() or 1) + 1
+        with publish_config(counters=["requests"]) as state:
+            assert state.slots == DEFAULT_SLOTS
+            monkeypatch.setenv(SHARED_CONFIG_SLOT_ENV, str(DEFAULT_SLOTS - 1))
+            config = attach_config()
+            config.shared.increment("requests")
+            assert state.counter("requests") == 1
+            config.shared.close()
+    
+    def test_context_manager_unlinks(self):
+        """Test the owner destroys the block on context exit."""
+        from src.utils.shared_config import SharedConfigError, SharedState
+        
+        with SharedState.create({"A": "1"}) as state:
+            name = state.name
+        with pytest.raises(SharedConfigError, match="not found"):
+            SharedState.attach(name)
+    
+    def test_get_config_attaches(self, clean_shared_env, monkeypatch):
+        """Test get_config uses the shared snapshot when one is published."""
+        from src.utils.config import get_config
+        from src.utils.shared_config import SharedConfig, publish_config
+        
+        monkeypatch.setenv("SHARED_TEST_VALUE", "42")
+        state = publish_config()
+        try:
+            monkeypatch.delenv("SHARED_TEST_VALUE")
+            config = get_config()
+            assert isinstance(config, SharedConfig)
+            assert config.get_int("SHARED_TEST_VALUE") == 42
+            assert config.get("SPECIFY_SHARED_CONFIG") is None
+            with pytest.raises(ConfigError, match="Required configuration missing"):
+                config.get("NONEXISTENT", required=True)
+            config.shared.close()
+        finally:
+            state.close()
+            state.unlink()
+    
+    def test_attach_config_without_block(self, clean_shared_env):
+        """Test attach_config fails clearly when nothing is published."""
+        from src.utils.shared_config import SharedConfigError, attach_config
+        
+        with pytest.raises(SharedConfigError, match="No shared config published"):
+            attach_config()